@@ -0,0 +1,78 @@
+"""
+Shared pytest fixtures for the Chrome debug scripts
+
+Each driver is started once per test session (once per worker under
+pytest-xdist) and reused by every test that asks for it.
+"""
+
+import os
+
+import pytest
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+def make_driver():
+    """Start Chrome on the persistent ./user_data WhatsApp profile."""
+    print("Setting up Chrome driver...")
+    
+    # Create user data directory with absolute path
+    user_data_dir = os.path.abspath("./user_data")
+    os.makedirs(user_data_dir, exist_ok=True)
+    print(f"Using user data directory: {user_data_dir}")
+    
+    chrome_options = Options()
+    # Needs a window for the QR scan, so only headless once the profile is logged in
+    if os.environ.get("WA_HEADLESS") == "1":
+        chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
+    chrome_options.add_argument("--remote-debugging-port=0")  # Use random port
+    
+    # Keep the profile's cache warm between runs and skip first-run work
+    chrome_options.add_argument("--profile-directory=Default")
+    chrome_options.add_argument("--disk-cache-size=268435456")
+    chrome_options.add_argument("--disable-background-networking")
+    chrome_options.add_argument("--disable-features=TranslateUI,MediaRouter,OptimizationHints")
+    chrome_options.add_argument("--no-first-run")
+    chrome_options.add_argument("--no-default-browser-check")
+    
+    # ChromeDriver waits for pending navigations before commands using this
+    # strategy, so eager lets the waits after Page.navigate start at
+    # DOMContentLoaded instead of the load event
+    chrome_options.page_load_strategy = "eager"
+    
+    # Selenium Manager resolves and caches a matching chromedriver
+    return webdriver.Chrome(options=chrome_options)
+
+def make_scratch_driver():
+    """Start a throwaway Chrome with no profile, headless unless WA_HEADLESS=0."""
+    chrome_options = Options()
+    if os.environ.get("WA_HEADLESS", "1") == "1":
+        chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--remote-debugging-port=0")  # Random port so parallel runs don't collide
+    
+    # driver.get returns at DOMContentLoaded; tests wait for what they need
+    chrome_options.page_load_strategy = "eager"
+    
+    return webdriver.Chrome(options=chrome_options)
+
+@pytest.fixture(scope="session")
+def driver():
+    """Chrome on the ./user_data WhatsApp profile.
+
+    Chrome can only open a profile once, so keep tests using this fixture on
+    a single xdist worker.
+    """
+    driver = make_driver()
+    yield driver
+    driver.quit()
+
+@pytest.fixture(scope="session")
+def scratch_driver():
+    """Profile-less Chrome for tests that don't need a WhatsApp login."""
+    driver = make_scratch_driver()
+    yield driver
+    driver.quit()
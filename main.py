@@ -6,27 +6,33 @@ Quick usage:
   pip install -r requirements.txt
   python main.py --chat 'Group Name'
   python main.py  (to iterate visible chats)
+  python main.py --daemon  (keep the browser open; later runs reuse it)
 
 Requirements:
-  selenium
-  webdriver-manager
-  pandas
+  selenium (4.11+, uses the built-in Selenium Manager)
+  orjson
+  selectolax
   python-dotenv
   tenacity
 """
 
 import argparse
 import csv
-import json
+import functools
 import os
 import random
 import re
+import socket
+import socketserver
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
-import pandas as pd
+import orjson
+from selectolax.lexbor import LexborHTMLParser
 from selenium import webdriver
 from selenium.common.exceptions import (
     ElementClickInterceptedException,
@@ -40,82 +46,347 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
 
 
 # WhatsApp Web selectors - update these if the UI changes
 SELECTORS = {
     # Main containers - multiple fallbacks for robustness
-    'chat_list_container': [
+    'chat_list_container': (
         "//div[@role='grid']",
         "//div[@data-testid='chat-list']",
         "//div[contains(@class, 'chat-list')]",
         "//div[@role='application']//div[@role='grid']"
-    ],
-    'chat_list_rows': [
+    ),
+    'chat_list_rows': (
         "//div[@role='row']",
         "//div[contains(@class, 'chat')]",
         "//div[@data-testid='chat-list']//div[contains(@class, 'row')]"
-    ],
-    'message_container': [
+    ),
+    'message_container': (
         "//div[@data-testid='msg-container']",
         "//div[contains(@class, 'message')]",
         "//div[@data-testid='conversation-panel-messages']//div[contains(@class, 'message')]"
-    ],
-    'chat_title': [
+    ),
+    'chat_title': (
         "//header//span[@data-testid='conversation-title']",
         "//header//span[contains(@class, 'title')]",
         "//div[@data-testid='conversation-header']//span"
-    ],
+    ),
     
     # Message elements
-    'message_bubble': [
+    'message_bubble': (
         "//div[contains(@class, 'message-in') or contains(@class, 'message-out')]",
         "//div[contains(@class, 'message')]"
-    ],
-    'message_text': [
+    ),
+    'message_text': (
         ".//span[@dir='auto' or @dir='ltr']",
         ".//span[contains(@class, 'selectable-text')]",
         ".//div[contains(@class, 'selectable-text')]"
-    ],
-    'message_metadata': [
+    ),
+    'message_metadata': (
         ".//div[@data-pre-plain-text]",
         ".//div[contains(@class, 'message-time')]"
-    ],
-    'message_sender': [
+    ),
+    'message_sender': (
         ".//span[@class='quoted-mention' or contains(@class, 'quoted-mention')]",
         ".//span[contains(@class, 'sender')]"
-    ],
+    ),
     
     # Search and navigation
-    'search_box': [
+    'search_box': (
         "//div[@data-testid='search']//input",
         "//input[@data-testid='search-input']",
         "//div[contains(@class, 'search')]//input"
-    ],
-    'search_results': [
+    ),
+    'search_results': (
         "//div[@data-testid='search-results']",
         "//div[contains(@class, 'search-results')]"
-    ],
+    ),
     
     # Media detection
-    'media_elements': [
+    'media_elements': (
         ".//img | .//video | .//div[contains(@class, 'document')] | .//div[contains(@class, 'audio')]",
         ".//img | .//video | .//div[contains(@class, 'media')]"
-    ],
+    ),
     
     # Loading indicators
-    'loading_spinner': [
+    'loading_spinner': (
         "//div[@data-testid='loading-spinner']",
         "//div[contains(@class, 'loading')]"
-    ],
-    'qr_code': [
+    ),
+    'qr_code': (
         "//div[@data-testid='qr-code']",
         "//canvas[@data-testid='qr-code']",
         "//div[contains(@class, 'qr')]"
-    ],
+    ),
 }
 
+# Column order for CSV exports
+MESSAGE_FIELDS = ('chat_name', 'sender', 'text', 'timestamp', 'has_media')
+
+# Write buffer for JSONL exports, so large exports hit the disk in few syscalls
+JSONL_BUFFER_SIZE = 1 << 20
+
+# All fallbacks for a key joined into one XPath union, so a lookup costs a
+# single round-trip; SELECTORS keeps the per-selector list for diagnostics
+SELECTORS_UNION = {key: " | ".join(selectors) for key, selectors in SELECTORS.items()}
+
+# CSS equivalents for the selectors that translate cleanly; Chrome's CSS
+# engine is faster than its XPath evaluator, so hot paths prefer these
+SELECTORS_CSS = {
+    'chat_list_container': (
+        'div[role="grid"]',
+        'div[data-testid="chat-list"]',
+        'div[class*="chat-list"]'
+    ),
+    'chat_list_rows': (
+        'div[role="row"]',
+        'div[class*="chat"]',
+        'div[class*="row"]'
+    ),
+    'message_container': (
+        'div[data-testid="msg-container"]',
+        'div[class*="message"]',
+        'div[data-testid="conversation-panel-messages"] div[class*="message"]'
+    ),
+    'message_text': (
+        'span[dir="auto"], span[dir="ltr"]',
+        'span[class*="selectable-text"]',
+        'div[class*="selectable-text"]'
+    ),
+    'search_box': (
+        'div[data-testid="search"] input',
+        'input[data-testid="search-input"]',
+        'div[class*="search"] input'
+    ),
+    'media_elements': (
+        'img, video, div[class*="document"], div[class*="audio"]',
+    ),
+    'qr_code': (
+        'div[data-testid="qr-code"]',
+        'canvas[data-testid="qr-code"]',
+        'div[class*="qr"]'
+    ),
+}
+
+# Message bubbles from any fallback that haven't been tagged data-wa-seen,
+# i.e. that belong to the chat opened last
+FRESH_MESSAGE_CSS = ", ".join(f"{selector}:not([data-wa-seen])" for selector in SELECTORS_CSS['message_container'])
+
+# Pre-compiled patterns used on every message / saved file
+_TS_RE = re.compile(r'\[(\d{1,2}:\d{2}(?::\d{2})?),\s*(\d{1,2}/\d{1,2}/\d{4})\]\s*(.+?):')
+_SANITIZE_RE = re.compile(r'[<>:"/\\|?*]')
+
+# Snapshot of the open conversation, parsed in Python so the whole chat is
+# read in a single round-trip (evaluated as a CDP expression)
+CONVERSATION_HTML_JS = "(document.querySelector('#main') || document.body).innerHTML"
+
+# Shared helpers for the chat list scripts below: find the element that
+# actually scrolls, and wait for a scroll step to render its rows
+_CHAT_LIST_HELPERS_JS = """
+function scrollableAncestor(el) {
+    // The grid itself may not scroll; climb to the element that does
+    while (el && el.scrollHeight <= el.clientHeight) {
+        el = el.parentElement;
+    }
+    return el;
+}
+
+function rowsIn(root, selectors) {
+    // Rows of the first fallback that matches anything under the chat list
+    for (var i = 0; i < selectors.length; i++) {
+        var rows = root.querySelectorAll(selectors[i]);
+        if (rows.length) {
+            return rows;
+        }
+    }
+    return [];
+}
+
+function settle(panel) {
+    // Resolve shortly after new rows stop arriving, or after a quiet period
+    return new Promise(function (resolve) {
+        var started = false;
+        function start() {
+            if (started) {
+                return;
+            }
+            started = true;
+            var timer;
+            var observer = new MutationObserver(function () {
+                clearTimeout(timer);
+                timer = setTimeout(finish, 50);
+            });
+            function finish() {
+                observer.disconnect();
+                resolve();
+            }
+            observer.observe(panel, {childList: true, subtree: true});
+            timer = setTimeout(finish, 300);
+        }
+        // Chrome pauses rAF while the window is hidden, so a timer backs it up
+        requestAnimationFrame(start);
+        setTimeout(start, 100);
+    });
+}
+"""
+
+# Async script: scrolls the chat list from the top and collects every row
+# title on the way (the list is virtualised, rows only exist while on screen)
+COLLECT_CHAT_TITLES_JS = _CHAT_LIST_HELPERS_JS + """
+var root = arguments[0] || document, rowSelectors = arguments[1], limit = arguments[2];
+var done = arguments[arguments.length - 1];
+var panel = arguments[0] ? scrollableAncestor(arguments[0]) : null;
+var titles = new Set();
+
+function collect() {
+    rowsIn(root, rowSelectors).forEach(function (row) {
+        var title = row.querySelector('span[title]');
+        if (title && title.getAttribute('title')) {
+            titles.add(title.getAttribute('title'));
+        }
+    });
+}
+
+if (!panel) {
+    collect();
+    done(Array.from(titles));
+    return;
+}
+
+(async function () {
+    panel.scrollTop = 0;
+    await settle(panel);
+    while (true) {
+        collect();
+        if (limit && titles.size >= limit) {
+            break;
+        }
+        var previous = panel.scrollTop;
+        panel.scrollTop = previous + panel.clientHeight;
+        await settle(panel);
+        if (panel.scrollTop === previous) {
+            break;
+        }
+    }
+    collect();
+    done(Array.from(titles));
+})();
+"""
+
+# Marks the bubbles of the chat currently open (so the next wait only accepts
+# fresh ones), then returns the chat row whose title matches, scrolling the
+# list to it if needed, or null when there is no such row
+FIND_CHAT_ROW_JS = _CHAT_LIST_HELPERS_JS + """
+var root = arguments[0] || document, name = arguments[1], rowSelectors = arguments[2];
+var bubbleSelector = arguments[3];
+var done = arguments[arguments.length - 1];
+var panel = arguments[0] ? scrollableAncestor(arguments[0]) : null;
+
+document.querySelectorAll(bubbleSelector).forEach(function (bubble) {
+    bubble.setAttribute('data-wa-seen', '1');
+});
+
+function find() {
+    var rows = rowsIn(root, rowSelectors);
+    for (var i = 0; i < rows.length; i++) {
+        var title = rows[i].querySelector('span[title]');
+        if (title && title.getAttribute('title') === name) {
+            return rows[i];
+        }
+    }
+    return null;
+}
+
+(async function () {
+    var row = find();
+    if (!row && panel) {
+        panel.scrollTop = 0;
+        while (true) {
+            await settle(panel);
+            row = find();
+            if (row) {
+                break;
+            }
+            var previous = panel.scrollTop;
+            panel.scrollTop = previous + panel.clientHeight;
+            if (panel.scrollTop === previous) {
+                break;
+            }
+        }
+    }
+    done(row);
+})();
+"""
+
+# Returns [element, selector] for the first ordered XPath fallback whose
+# first match is rendered, so lookup and visibility cost one round-trip
+FIND_VISIBLE_JS = """
+var selectors = arguments[0];
+for (var i = 0; i < selectors.length; i++) {
+    var node;
+    try {
+        node = document.evaluate(selectors[i], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    } catch (e) {
+        continue;
+    }
+    if (node) {
+        var rect = node.getBoundingClientRect();
+        if (rect.width > 0 && rect.height > 0) {
+            return [node, selectors[i]];
+        }
+    }
+}
+return null;
+"""
+
+# Marks the bubbles of the chat currently open, so waits after opening
+# another chat only accept fresh ones
+MARK_MESSAGES_SEEN_JS = """
+document.querySelectorAll(arguments[0]).forEach(function (bubble) {
+    bubble.setAttribute('data-wa-seen', '1');
+});
+"""
+
+# Per-user cache for the daemon socket
+CACHE_DIR = Path.home() / ".cache" / "whatsapp_extractor"
+DAEMON_SOCKET = CACHE_DIR / "daemon.sock"
+
+# How long (seconds) a liveness ping may take before the daemon counts as wedged
+DAEMON_PING_TIMEOUT = 5
+
+# WhatsApp links at most four companion devices to a phone; the main profile
+# is one of them and every --workers profile is another
+MAX_LINKED_DEVICES = 4
+MAX_WORKERS = MAX_LINKED_DEVICES - 1
+
+# Upper bound (seconds) for async in-page scripts such as the chat list scan
+SCRIPT_TIMEOUT = 120
+
+# How long to wait for a freshly opened chat to render its first message
+MESSAGES_READY_TIMEOUT_MS = 3000
+
+# Async script: resolves as soon as a message bubble is in the DOM, watching
+# mutations instead of sleeping, or with false once the timeout passes
+WAIT_FOR_MESSAGES_JS = """
+var selector = arguments[0], timeout = arguments[1], done = arguments[arguments.length - 1];
+if (document.querySelector(selector)) {
+    done(true);
+    return;
+}
+var observer = new MutationObserver(function () {
+    if (document.querySelector(selector)) {
+        observer.disconnect();
+        done(true);
+    }
+});
+observer.observe(document.body, {childList: true, subtree: true});
+setTimeout(function () {
+    observer.disconnect();
+    done(false);
+}, timeout);
+"""
+
 
 class WhatsAppExtractor:
     def __init__(self, user_data_dir: str = "./user_data", headless: bool = False):
@@ -123,40 +394,31 @@ class WhatsAppExtractor:
         self.headless = headless
         self.driver = None
         self.wait = None
+        self._cdp = None
+        self._resolved_selectors: Dict[str, str] = {}
+        self._output_dir: Optional[str] = None
+        self._command_lock = threading.Lock()
         
-    def find_element_with_fallbacks(self, selector_key: str, timeout: int = 10):
-        """Find element using multiple selector fallbacks."""
-        selectors = SELECTORS.get(selector_key, [])
-        if isinstance(selectors, str):
-            selectors = [selectors]
-            
-        for selector in selectors:
-            try:
-                if selector and isinstance(selector, str):  # Ensure selector is a valid string
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    if elements and elements[0].is_displayed():
-                        return elements[0]
-            except Exception as e:
-                print(f"Selector failed: {selector} - {e}")
-                continue
-        return None
+    def _ordered_selectors(self, selector_key: str) -> Tuple[str, ...]:
+        """Return selector fallbacks, trying the last one that matched first."""
+        selectors = SELECTORS.get(selector_key, ())
+        resolved = self._resolved_selectors.get(selector_key)
+        if resolved:
+            return (resolved,) + tuple(s for s in selectors if s != resolved)
+        return selectors
         
-    def find_elements_with_fallbacks(self, selector_key: str):
-        """Find elements using multiple selector fallbacks."""
-        selectors = SELECTORS.get(selector_key, [])
-        if isinstance(selectors, str):
-            selectors = [selectors]
-            
-        for selector in selectors:
-            try:
-                if selector and isinstance(selector, str):  # Ensure selector is a valid string
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    if elements:
-                        return elements
-            except Exception as e:
-                print(f"Selector failed: {selector} - {e}")
-                continue
-        return []
+    def find_element_with_fallbacks(self, selector_key: str, timeout: int = 10):
+        """Find the first visible element using multiple selector fallbacks."""
+        try:
+            match = self.driver.execute_script(FIND_VISIBLE_JS, list(self._ordered_selectors(selector_key)))
+        except WebDriverException as e:
+            print(f"Selectors failed for '{selector_key}': {e}")
+            return None
+        if not match:
+            return None
+        element, selector = match
+        self._resolved_selectors[selector_key] = selector
+        return element
         
     def setup_driver(self) -> None:
         """Initialize Chrome WebDriver with persistent user profile."""
@@ -166,6 +428,18 @@ class WhatsAppExtractor:
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
         
+        # Skip work the extractor never uses: media is only detected by tag,
+        # so images don't need downloading or decoding
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--disable-background-networking")
+        chrome_options.add_argument("--disable-features=Translate,MediaRouter")
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        })
+        
         # Add user data directory only if not headless (to avoid conflicts)
         if not self.headless:
             # Ensure user data directory exists with proper permissions
@@ -180,14 +454,57 @@ class WhatsAppExtractor:
         # Use random debugging port to avoid conflicts
         chrome_options.add_argument("--remote-debugging-port=0")
         
-        # Initialize WebDriver
-        service = Service(ChromeDriverManager().install())
+        # Initialize WebDriver; Selenium Manager finds and caches a matching
+        # chromedriver unless CHROMEDRIVER_PATH points at one explicitly
+        service = Service(executable_path=os.environ.get("CHROMEDRIVER_PATH"))
         self.driver = webdriver.Chrome(service=service, options=chrome_options)
         self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        self._cdp = self.driver.execute_cdp_cmd
         
         # Set up wait with longer timeout
         self.wait = WebDriverWait(self.driver, 15)
         
+        # Async scripts scroll through the whole chat list, allow them time
+        self.driver.set_script_timeout(SCRIPT_TIMEOUT)
+        
+    def _evaluate(self, expression: str):
+        """Evaluate a JS expression over CDP and return its value."""
+        response = self._cdp('Runtime.evaluate', {
+            'expression': expression,
+            'returnByValue': True,
+            'awaitPromise': False,
+        })
+        if 'exceptionDetails' in response:
+            raise WebDriverException(response['exceptionDetails'].get('text', 'Script evaluation failed'))
+        return response['result'].get('value')
+        
+    def wait_for_messages(self, timeout_ms: int = MESSAGES_READY_TIMEOUT_MS) -> bool:
+        """Block until the open chat has rendered a fresh message bubble, or the timeout passes."""
+        try:
+            return bool(self.driver.execute_async_script(
+                WAIT_FOR_MESSAGES_JS, FRESH_MESSAGE_CSS, timeout_ms
+            ))
+        except (TimeoutException, WebDriverException) as e:
+            print(f"Waiting for messages failed: {e}")
+            return False
+            
+    def mark_messages_seen(self) -> None:
+        """Tag the open chat's bubbles so wait_for_messages ignores them after a switch."""
+        try:
+            self.driver.execute_script(MARK_MESSAGES_SEEN_JS, ", ".join(SELECTORS_CSS['message_container']))
+        except WebDriverException as e:
+            print(f"Marking messages failed: {e}")
+            
+    def wait_for_chat_switch(self, previous_title: str) -> None:
+        """Wait until a newly clicked chat shows fresh bubbles or a different header title."""
+        try:
+            WebDriverWait(self.driver, MESSAGES_READY_TIMEOUT_MS / 1000).until(EC.any_of(
+                EC.presence_of_element_located((By.CSS_SELECTOR, FRESH_MESSAGE_CSS)),
+                lambda driver: self.get_chat_title() not in (previous_title, "Unknown Chat"),
+            ))
+        except TimeoutException:
+            print("Chat is taking long to open, continuing...")
+            
     def random_sleep(self, min_seconds: float = 0.5, max_seconds: float = 1.2) -> None:
         """Random sleep between interactions."""
         time.sleep(random.uniform(min_seconds, max_seconds))
@@ -195,78 +512,60 @@ class WhatsAppExtractor:
     def handle_qr_code(self) -> None:
         """Handle QR code scanning if needed."""
         try:
-            # Wait a bit for the page to load
-            self.random_sleep(3, 5)
-            
             # Check if QR code is present and visible
-            qr_elements = self.find_elements_with_fallbacks('qr_code')
-            if qr_elements and qr_elements[0].is_displayed():
+            qr_element = self.find_element_with_fallbacks('qr_code')
+            if qr_element:
                 print("Scan the WhatsApp Web QR code, then press Enter...")
                 input()
                 
                 # Wait for QR to disappear and interface to load
                 print("Waiting for WhatsApp Web to load...")
-                max_wait_time = 30  # Wait up to 30 seconds
-                start_time = time.time()
-                
-                while time.time() - start_time < max_wait_time:
-                    try:
-                        # Check if QR code is gone and chat list is present
-                        qr_elements = self.find_elements_with_fallbacks('qr_code')
-                        chat_list = self.find_elements_with_fallbacks('chat_list_container')
-                        
-                        if (not qr_elements or not qr_elements[0].is_displayed()) and chat_list:
-                            print("WhatsApp Web loaded successfully!")
-                            return
-                            
-                    except Exception:
-                        pass
-                    
-                    time.sleep(1)
-                
-                # If we get here, try to continue anyway
-                print("QR code handling completed, continuing...")
+                try:
+                    WebDriverWait(self.driver, 30).until(EC.all_of(
+                        EC.invisibility_of_element(qr_element),
+                        EC.presence_of_element_located((By.CSS_SELECTOR, ", ".join(SELECTORS_CSS['chat_list_container']))),
+                    ))
+                    print("WhatsApp Web loaded successfully!")
+                except TimeoutException:
+                    # Try to continue anyway
+                    print("QR code handling completed, continuing...")
                 
         except Exception as e:
             print(f"QR code handling: {e}")
             # Continue anyway, might already be logged in
             
-    def navigate_to_whatsapp(self) -> None:
-        """Navigate to WhatsApp Web and handle login."""
+    def navigate_to_whatsapp(self, interactive: bool = True) -> None:
+        """Navigate to WhatsApp Web and handle login, or fail if a non-interactive profile is logged out."""
         print("Navigating to WhatsApp Web...")
         self.driver.get("https://web.whatsapp.com")
-        self.random_sleep(2, 3)
         
-        # Handle QR code if needed
+        # Wait until either the chat list or the QR code has rendered
+        try:
+            WebDriverWait(self.driver, 40).until(EC.any_of(
+                EC.presence_of_element_located((By.CSS_SELECTOR, ", ".join(SELECTORS_CSS['chat_list_container']))),
+                EC.presence_of_element_located((By.CSS_SELECTOR, ", ".join(SELECTORS_CSS['qr_code']))),
+            ))
+        except TimeoutException:
+            print("WhatsApp Web is taking long to render, continuing...")
+        
+        # Handle QR code if needed; worker processes have no terminal to prompt on
+        if not interactive and self.find_element_with_fallbacks('qr_code'):
+            raise RuntimeError(
+                f"Profile {self.user_data_dir} is not linked; delete it and rerun to scan a new QR code"
+            )
         self.handle_qr_code()
         
-        # Wait for main interface to load with more flexible approach
+        # Wait for main interface to load
         print("Waiting for WhatsApp Web interface to load...")
-        max_attempts = 20
-        for attempt in range(max_attempts):
-            try:
-                # Try to find chat list using fallback selectors
-                chat_list = self.find_element_with_fallbacks('chat_list_container')
-                if chat_list:
-                    print("WhatsApp Web interface loaded successfully!")
-                    return
-                
-                # Also check if we're on the main page (not QR page)
-                if "web.whatsapp.com" in self.driver.current_url and "qr" not in self.driver.current_url.lower():
-                    # Try to find any chat-related elements
-                    chat_elements = self.driver.find_elements(By.XPATH, "//div[contains(@class, 'chat') or contains(@data-testid, 'chat')]")
-                    if chat_elements:
-                        print("WhatsApp Web interface loaded successfully!")
-                        return
-                
-            except Exception as e:
-                print(f"Attempt {attempt + 1}/{max_attempts}: {e}")
-            
-            time.sleep(2)
-        
-        # If we get here, try to continue anyway - might still work
-        print("Interface loading timeout, but continuing...")
-        print("If extraction fails, try running with --headless false to see what's happening")
+        try:
+            WebDriverWait(self.driver, 40).until(
+                lambda driver: self.find_element_with_fallbacks('chat_list_container')
+            )
+            print("WhatsApp Web interface loaded successfully!")
+        except TimeoutException:
+            # If we get here, try to continue anyway - might still work
+            print("Interface loading timeout, but continuing...")
+            print("If extraction fails, try running with --headless false to see what's happening")
             
     def find_chat_by_name(self, chat_name: str) -> bool:
         """Find and open a specific chat by name."""
@@ -274,7 +573,7 @@ class WhatsAppExtractor:
         
         try:
             # Click search box
-            search_box = self.wait.until(EC.element_to_be_clickable((By.XPATH, SELECTORS['search_box'])))
+            search_box = self.wait.until(EC.element_to_be_clickable((By.XPATH, SELECTORS_UNION['search_box'])))
             search_box.click()
             self.random_sleep(0.5, 1.0)
             
@@ -283,14 +582,18 @@ class WhatsAppExtractor:
             search_box.send_keys(chat_name)
             self.random_sleep(1, 2)
             
+            # Remember what is open now, so we can tell when the new chat has rendered
+            previous_title = self.get_chat_title()
+            self.mark_messages_seen()
+            
             # Look for exact match in search results
-            search_results = self.driver.find_elements(By.XPATH, SELECTORS['search_results'])
+            search_results = self.driver.find_elements(By.XPATH, SELECTORS_UNION['search_results'])
             for result in search_results:
                 try:
                     result_text = result.text.strip()
                     if result_text == chat_name:
                         result.click()
-                        self.random_sleep(1, 2)
+                        self.wait_for_chat_switch(previous_title)
                         return True
                 except (ElementClickInterceptedException, NoSuchElementException):
                     continue
@@ -298,7 +601,7 @@ class WhatsAppExtractor:
             # If not found in search results, try clicking first result
             if search_results:
                 search_results[0].click()
-                self.random_sleep(1, 2)
+                self.wait_for_chat_switch(previous_title)
                 return True
                 
             return False
@@ -318,32 +621,16 @@ class WhatsAppExtractor:
             print(f"Error getting chat title: {e}")
             return "Unknown Chat"
             
-    def get_all_visible_chats(self) -> List[str]:
-        """Get list of all visible chat names in the left pane."""
-        chat_names = []
+    def get_all_visible_chats(self, limit: Optional[int] = None) -> List[str]:
+        """Get list of chat names in the left pane, scrolling through the whole list."""
         try:
-            # Scroll to top first
             chat_list = self.find_element_with_fallbacks('chat_list_container')
-            if chat_list:
-                self.driver.execute_script("arguments[0].scrollTop = 0;", chat_list)
-                self.random_sleep(1, 2)
             
-            # Get initial visible chats
-            chat_rows = self.find_elements_with_fallbacks('chat_list_rows')
-            
-            for row in chat_rows:
-                try:
-                    # Try to get chat name from the row
-                    chat_name_elements = row.find_elements(By.XPATH, ".//span[@title]")
-                    if chat_name_elements:
-                        chat_name = chat_name_elements[0].get_attribute('title')
-                        if chat_name and chat_name not in chat_names:
-                            chat_names.append(chat_name)
-                except (NoSuchElementException, Exception) as e:
-                    print(f"Error getting chat name: {e}")
-                    continue
-                    
-            return chat_names
+            # Scroll and collect in-page, a single round-trip for the whole list
+            titles = self.driver.execute_async_script(
+                COLLECT_CHAT_TITLES_JS, chat_list, list(SELECTORS_CSS['chat_list_rows']), limit
+            ) or []
+            return list(dict.fromkeys(title for title in titles if title))
             
         except Exception as e:
             print(f"Error getting visible chats: {e}")
@@ -355,70 +642,80 @@ class WhatsAppExtractor:
         
         try:
             # Wait for messages to load
-            self.random_sleep(1, 2)
+            self.wait_for_messages()
             
-            # Get all message containers
-            message_containers = self.driver.find_elements(By.XPATH, SELECTORS['message_container'])
+            # Snapshot the conversation once and parse it locally
+            html = self._evaluate(CONVERSATION_HTML_JS) or ''
+            raw_messages = self.parse_messages_html(html)
+            metadata = self.parse_metadata([raw['pre'] for raw in raw_messages])
             
-            for container in message_containers:
-                try:
-                    message_data = self.parse_message(container, chat_name)
-                    if message_data:
-                        messages.append(message_data)
-                except Exception as e:
-                    print(f"Error parsing message: {e}")
-                    continue
+            for raw, (timestamp, sender) in zip(raw_messages, metadata):
+                message_data = self.parse_message(raw, chat_name, timestamp, sender)
+                if message_data:
+                    messages.append(message_data)
                     
-        except NoSuchElementException:
-            print(f"No messages found in chat: {chat_name}")
+        except WebDriverException as e:
+            print(f"No messages found in chat: {chat_name} - {e}")
             
         return messages
         
-    def parse_message(self, container, chat_name: str) -> Optional[Dict]:
-        """Parse a single message container into structured data."""
+    def parse_messages_html(self, html: str) -> List[Dict]:
+        """Pull the raw fields of every message bubble out of a conversation snapshot."""
+        raw_messages = []
+        for bubble in self._first_matching(LexborHTMLParser(html), 'message_container'):
+            meta = bubble.css_first('[data-pre-plain-text]')
+            sender = bubble.css_first('span.quoted-mention, span[class*="sender"]')
+            texts = (el.text().strip() for el in self._first_matching(bubble, 'message_text'))
+            raw_messages.append({
+                'pre': (meta.attributes.get('data-pre-plain-text') or '') if meta else '',
+                'text': ' '.join(text for text in texts if text),
+                'has_media': bubble.css_first(SELECTORS_CSS['media_elements'][0]) is not None,
+                'sender': sender.text().strip() if sender else '',
+                'cls': bubble.attributes.get('class') or '',
+            })
+        return raw_messages
+        
+    @staticmethod
+    def _first_matching(node, selector_key: str) -> List:
+        """Return the matches of the first CSS fallback that finds anything under node."""
+        for selector in SELECTORS_CSS[selector_key]:
+            matches = node.css(selector)
+            if matches:
+                return matches
+        return []
+        
+    def parse_metadata(self, pres: List[str]) -> List[Tuple[str, str]]:
+        """Parse data-pre-plain-text values into (timestamp, sender) pairs in one pass."""
+        # Consecutive messages often share a prefix, so match each distinct one once
+        parsed = {}
+        for pre in dict.fromkeys(pres):
+            # Parse metadata: "[time, date] Sender:"
+            match = _TS_RE.match(pre) if pre else None
+            if match:
+                time_str, date_str, sender = match.groups()
+                parsed[pre] = (f"{date_str} {time_str}", sender.strip())
+        return [parsed.get(pre, ('', '')) for pre in pres]
+        
+    def parse_message(self, raw: Dict, chat_name: str, timestamp: str = '', sender: str = '') -> Optional[Dict]:
+        """Build structured data from a raw message bubble and its parsed metadata."""
         try:
             # Initialize message data
             message_data = {
                 'chat_name': chat_name,
-                'sender': '',
-                'text': '',
-                'timestamp': '',
-                'has_media': False
+                'sender': sender,
+                'text': raw.get('text', ''),
+                'timestamp': timestamp,
+                'has_media': bool(raw.get('has_media'))
             }
             
-            # Check for media
-            media_elements = container.find_elements(By.XPATH, SELECTORS['media_elements'])
-            message_data['has_media'] = len(media_elements) > 0
-            
-            # Try to get metadata from data-pre-plain-text
-            metadata_elements = container.find_elements(By.XPATH, SELECTORS['message_metadata'])
-            if metadata_elements:
-                metadata = metadata_elements[0].get_attribute('data-pre-plain-text')
-                if metadata:
-                    # Parse metadata: "[time, date] Sender:"
-                    match = re.match(r'\[(\d{1,2}:\d{2}(?::\d{2})?),\s*(\d{1,2}/\d{1,2}/\d{4})\]\s*(.+?):', metadata)
-                    if match:
-                        time_str, date_str, sender = match.groups()
-                        message_data['timestamp'] = f"{date_str} {time_str}"
-                        message_data['sender'] = sender.strip()
-            
-            # Get message text
-            text_elements = container.find_elements(By.XPATH, SELECTORS['message_text'])
-            if text_elements:
-                message_data['text'] = ' '.join([elem.text.strip() for elem in text_elements if elem.text.strip()])
-            
             # If no sender found from metadata, try to infer from message direction
             if not message_data['sender']:
                 # Check if it's an outgoing message (from me)
-                if 'message-out' in container.get_attribute('class'):
+                if 'message-out' in raw.get('cls', ''):
                     message_data['sender'] = 'Me'
                 else:
-                    # For incoming messages, try to get sender from bubble header
-                    sender_elements = container.find_elements(By.XPATH, SELECTORS['message_sender'])
-                    if sender_elements:
-                        message_data['sender'] = sender_elements[0].text.strip()
-                    else:
-                        message_data['sender'] = 'Unknown'
+                    # For incoming messages, fall back to the bubble header
+                    message_data['sender'] = raw.get('sender') or 'Unknown'
             
             return message_data
             
@@ -432,9 +729,10 @@ class WhatsAppExtractor:
             print("No messages to save")
             return
             
-        df = pd.DataFrame(messages)
-        df = df[['chat_name', 'sender', 'text', 'timestamp', 'has_media']]  # Ensure column order
-        df.to_csv(output_path, index=False, encoding='utf-8')
+        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=MESSAGE_FIELDS)
+            writer.writeheader()
+            writer.writerows(messages)
         print(f"Saved {len(messages)} messages to {output_path}")
         
     def save_to_jsonl(self, messages: List[Dict], output_path: str) -> None:
@@ -443,14 +741,19 @@ class WhatsAppExtractor:
             print("No messages to save")
             return
             
-        with open(output_path, 'w', encoding='utf-8') as f:
-            for message in messages:
-                f.write(json.dumps(message, ensure_ascii=False) + '\n')
+        with open(output_path, 'wb', buffering=JSONL_BUFFER_SIZE) as f:
+            self.write_jsonl_lines(f, messages)
         print(f"Saved {len(messages)} messages to {output_path}")
         
-    def sanitize_filename(self, filename: str) -> str:
+    def write_jsonl_lines(self, f, messages: List[Dict]) -> None:
+        """Append messages to a JSONL file opened in binary mode, one object per line."""
+        f.writelines(orjson.dumps(message, option=orjson.OPT_APPEND_NEWLINE) for message in messages)
+        
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def sanitize_filename(filename: str) -> str:
         """Sanitize filename for safe file system usage."""
-        return re.sub(r'[<>:"/\\|?*]', '_', filename)
+        return _SANITIZE_RE.sub('_', filename)
         
     def create_output_directory(self) -> str:
         """Create output directory with current date."""
@@ -459,27 +762,29 @@ class WhatsAppExtractor:
         output_dir.mkdir(parents=True, exist_ok=True)
         return str(output_dir)
         
-    def extract_single_chat(self, chat_name: str) -> None:
-        """Extract messages from a single chat."""
+    def extract_single_chat(self, chat_name: str) -> Dict:
+        """Extract messages from a single chat and return a summary of the result."""
         print(f"Extracting messages from chat: {chat_name}")
+        result = {'found': False, 'chat': chat_name, 'messages': 0, 'outputs': []}
         
         if not self.find_chat_by_name(chat_name):
             print(f"Chat '{chat_name}' not found")
-            return
+            return result
             
         # Get actual chat title (might be different from search term)
         actual_chat_name = self.get_chat_title()
         print(f"Opened chat: {actual_chat_name}")
+        result.update(found=True, chat=actual_chat_name)
         
         # Extract messages
         messages = self.extract_messages_from_chat(actual_chat_name)
         
         if not messages:
             print("No messages found")
-            return
+            return result
             
         # Create output directory
-        output_dir = self.create_output_directory()
+        output_dir = self._output_dir or self.create_output_directory()
         
         # Save to files
         sanitized_name = self.sanitize_filename(actual_chat_name)
@@ -488,75 +793,168 @@ class WhatsAppExtractor:
         
         self.save_to_csv(messages, csv_path)
         self.save_to_jsonl(messages, jsonl_path)
+        result.update(messages=len(messages), outputs=[csv_path, jsonl_path])
+        return result
+        
+    def open_chat_from_list(self, chat_name: str) -> bool:
+        """Open a chat by clicking its row in the left pane, scrolling to it if needed."""
+        try:
+            row = self.driver.execute_async_script(
+                FIND_CHAT_ROW_JS,
+                self.find_element_with_fallbacks('chat_list_container'),
+                chat_name,
+                list(SELECTORS_CSS['chat_list_rows']),
+                ", ".join(SELECTORS_CSS['message_container']),
+            )
+            if not row:
+                return False
+            row.click()
+            return True
+        except WebDriverException as e:
+            print(f"Error opening chat '{chat_name}' from list: {e}")
+            return False
+            
+    def extract_chat_messages(self, chat_name: str) -> Optional[List[Dict]]:
+        """Open a chat by name and extract its messages, or None if it can't be opened."""
+        # Names come from the chat list, so click the row and only search as a fallback
+        if not self.open_chat_from_list(chat_name) and not self.find_chat_by_name(chat_name):
+            return None
+        return self.extract_messages_from_chat(chat_name)
+        
+    def _extract_sequential(self, chat_names: List[str]) -> Iterator[Tuple[str, Optional[List[Dict]]]]:
+        """Extract chats one after another in this browser."""
+        for i, chat_name in enumerate(chat_names, 1):
+            try:
+                print(f"Processing chat {i}/{len(chat_names)}: {chat_name}")
+                yield chat_name, self.extract_chat_messages(chat_name)
+            except Exception as e:
+                print(f"  Error processing chat '{chat_name}': {e}")
+                
+    def _shard_profile(self, index: int) -> Path:
+        """Return a worker's own profile directory, linking it as a new device on first use."""
+        shard_dir = self.user_data_dir.with_name(f"{self.user_data_dir.name}_shard_{index}")
+        if not shard_dir.exists():
+            # Each worker has to be its own linked device: copies of the main
+            # profile would all be the same device and knock each other offline
+            print(f"Linking worker profile {shard_dir} as a new device")
+            linker = WhatsAppExtractor(user_data_dir=str(shard_dir), headless=False)
+            try:
+                linker.setup_driver()
+                linker.navigate_to_whatsapp()
+            finally:
+                if linker.driver:
+                    linker.driver.quit()
+        return shard_dir
         
-    def extract_all_chats(self, max_chats: Optional[int] = None) -> None:
-        """Extract messages from all visible chats."""
+    def _extract_sharded(self, chat_names: List[str], workers: int) -> Iterator[Tuple[str, Optional[List[Dict]]]]:
+        """Extract chats in parallel, one browser profile per worker process."""
+        shards = [shard for shard in (chat_names[i::workers] for i in range(workers)) if shard]
+        print(f"Splitting chats across {len(shards)} workers")
+        
+        # Link any new worker profiles before starting workers, so QR prompts don't interleave
+        profiles = [self._shard_profile(i) for i in range(len(shards))]
+        
+        with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+            futures = [
+                executor.submit(_extract_shard, str(profile), self.headless, shard)
+                for profile, shard in zip(profiles, shards)
+            ]
+            for future in as_completed(futures):
+                try:
+                    yield from future.result().items()
+                except Exception as e:
+                    print(f"  Worker failed: {e}")
+                    
+    def extract_all_chats(self, max_chats: Optional[int] = None, workers: int = 1) -> Dict:
+        """Extract messages from all visible chats and return a summary of the result."""
         print("Extracting messages from all visible chats...")
+        result = {'found': False, 'chats': 0, 'messages': 0, 'outputs': []}
         
         # Get list of all visible chats
-        chat_names = self.get_all_visible_chats()
+        chat_names = self.get_all_visible_chats(max_chats)
         
         if not chat_names:
             print("No visible chats found")
-            return
+            return result
             
         if max_chats:
             chat_names = chat_names[:max_chats]
             
         print(f"Found {len(chat_names)} chats to process")
+        result['found'] = True
         
-        all_messages = []
+        # Create output directory
+        output_dir = self._output_dir or self.create_output_directory()
+        csv_path = f"{output_dir}/messages_all.csv"
+        jsonl_path = f"{output_dir}/messages_all.jsonl"
+        
+        total_messages = 0
         processed_chats = 0
         
-        for chat_name in chat_names:
-            try:
-                print(f"Processing chat {processed_chats + 1}/{len(chat_names)}: {chat_name}")
-                
-                if self.find_chat_by_name(chat_name):
-                    actual_chat_name = self.get_chat_title()
-                    messages = self.extract_messages_from_chat(actual_chat_name)
+        if workers > 1 and self.headless:
+            # Headless browsers don't load the profile, so workers would start logged out
+            print("Parallel workers need the logged-in profile, which headless mode skips; using one worker")
+            workers = 1
+        if workers > 1 and self.user_data_dir.name in ('', '.', '..'):
+            print("Worker profiles are created next to the user data directory, which needs a name; using one worker")
+            workers = 1
+        if workers > MAX_WORKERS:
+            print(f"WhatsApp links at most {MAX_LINKED_DEVICES} devices; using {MAX_WORKERS} workers")
+            workers = MAX_WORKERS
+            
+        if workers > 1:
+            results = self._extract_sharded(chat_names, workers)
+        else:
+            results = self._extract_sequential(chat_names)
+        
+        # Stream each chat's messages to disk as soon as it is extracted
+        with open(csv_path, 'w', newline='', encoding='utf-8') as csv_file, \
+                open(jsonl_path, 'wb', buffering=JSONL_BUFFER_SIZE) as jsonl_file:
+            csv_writer = csv.DictWriter(csv_file, fieldnames=MESSAGE_FIELDS)
+            csv_writer.writeheader()
+            
+            for chat_name, messages in results:
+                if messages is None:
+                    print(f"  Failed to open chat: {chat_name}")
+                    continue
                     
-                    if messages:
-                        all_messages.extend(messages)
-                        print(f"  Extracted {len(messages)} messages")
-                    else:
-                        print(f"  No messages found")
-                        
-                    processed_chats += 1
-                    self.random_sleep(1, 2)
+                if messages:
+                    csv_writer.writerows(messages)
+                    self.write_jsonl_lines(jsonl_file, messages)
+                    total_messages += len(messages)
+                    print(f"  Extracted {len(messages)} messages from {chat_name}")
                 else:
-                    print(f"  Failed to open chat: {chat_name}")
+                    print(f"  No messages found in {chat_name}")
                     
-            except Exception as e:
-                print(f"  Error processing chat '{chat_name}': {e}")
-                continue
+                processed_chats += 1
                 
-        if not all_messages:
+        if not total_messages:
+            Path(csv_path).unlink()
+            Path(jsonl_path).unlink()
             print("No messages extracted from any chat")
-            return
+            result['chats'] = processed_chats
+            return result
             
-        # Create output directory
-        output_dir = self.create_output_directory()
-        
-        # Save to files
-        csv_path = f"{output_dir}/messages_all.csv"
-        jsonl_path = f"{output_dir}/messages_all.jsonl"
+        print(f"Saved {total_messages} messages to {csv_path}")
+        print(f"Saved {total_messages} messages to {jsonl_path}")
+        print(f"Total: {total_messages} messages from {processed_chats} chats")
+        result.update(chats=processed_chats, messages=total_messages, outputs=[csv_path, jsonl_path])
+        return result
         
-        self.save_to_csv(all_messages, csv_path)
-        self.save_to_jsonl(all_messages, jsonl_path)
-        
-        print(f"Total: {len(all_messages)} messages from {processed_chats} chats")
-        
-    def run(self, chat_name: Optional[str] = None, max_chats: Optional[int] = None, debug: bool = False) -> None:
+    def run(self, chat_name: Optional[str] = None, max_chats: Optional[int] = None, debug: bool = False,
+            workers: int = 1) -> None:
         """Main execution method."""
         try:
             self.setup_driver()
             self.navigate_to_whatsapp()
             
+            # Resolve the output directory once for the whole run
+            self._output_dir = self.create_output_directory()
+            
             if chat_name:
                 self.extract_single_chat(chat_name)
             else:
-                self.extract_all_chats(max_chats)
+                self.extract_all_chats(max_chats, workers)
                 
         except Exception as e:
             print(f"Error: {e}")
@@ -567,6 +965,115 @@ class WhatsAppExtractor:
             if self.driver and not debug:
                 self.driver.quit()
 
+    def handle_command(self, command: Dict) -> Dict:
+        """Run one daemon command against the already open browser."""
+        action = command.get('action')
+        if action == 'ping':
+            return {'status': 'ok'}
+        if action == 'extract':
+            # One browser, so one extraction at a time; tell other clients right away
+            if not self._command_lock.acquire(blocking=False):
+                return {'status': 'busy'}
+            try:
+                self._output_dir = self.create_output_directory()
+                if command.get('chat'):
+                    result = self.extract_single_chat(command['chat'])
+                else:
+                    result = self.extract_all_chats(command.get('max_chats'), command.get('workers', 1))
+            finally:
+                self._command_lock.release()
+            # Output paths are relative to the daemon's working directory
+            result['outputs'] = [str(Path(path).resolve()) for path in result['outputs']]
+            return {'status': 'ok', **result}
+        return {'status': 'error', 'error': f"Unknown action: {action}"}
+        
+    def serve(self, socket_path: Path = DAEMON_SOCKET) -> None:
+        """Keep one browser session open and run extractions sent over a Unix socket."""
+        if send_to_daemon({'action': 'ping'}, socket_path, DAEMON_PING_TIMEOUT) is not None:
+            print(f"A daemon is already listening on {socket_path}, not starting another")
+            return
+            
+        bound = False
+        try:
+            self.setup_driver()
+            self.navigate_to_whatsapp()
+            
+            # Another daemon may have come up while this browser was starting
+            if send_to_daemon({'action': 'ping'}, socket_path, DAEMON_PING_TIMEOUT) is not None:
+                print(f"A daemon is already listening on {socket_path}, not starting another")
+                return
+                
+            # Nothing answered, so a socket file left here is stale
+            socket_path.parent.mkdir(parents=True, exist_ok=True)
+            if socket_path.exists():
+                socket_path.unlink()
+                
+            # Threaded so pings and busy replies aren't stuck behind a running extraction
+            with socketserver.ThreadingUnixStreamServer(str(socket_path), _DaemonHandler) as server:
+                bound = True
+                server.daemon_threads = True
+                server.extractor = self
+                print(f"Daemon listening on {socket_path} (Ctrl+C to stop)")
+                server.serve_forever()
+        except Exception as e:
+            print(f"Error: {e}")
+        finally:
+            # Only remove the socket this process created, never a live daemon's
+            if bound and socket_path.exists():
+                socket_path.unlink()
+            if self.driver:
+                self.driver.quit()
+
+
+class _DaemonHandler(socketserver.StreamRequestHandler):
+    """Reads one JSON command per connection and writes back one JSON response."""
+    
+    def handle(self) -> None:
+        try:
+            command = orjson.loads(self.rfile.readline())
+            response = self.server.extractor.handle_command(command)
+        except Exception as e:
+            response = {'status': 'error', 'error': str(e)}
+        self.wfile.write(orjson.dumps(response, option=orjson.OPT_APPEND_NEWLINE))
+
+
+def send_to_daemon(command: Dict, socket_path: Path = DAEMON_SOCKET,
+                   timeout: Optional[float] = None) -> Optional[Dict]:
+    """Send a command to a running daemon, or return None if none is listening."""
+    if not hasattr(socket, 'AF_UNIX') or not socket_path.exists():
+        return None
+        
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(socket_path))
+            sock.sendall(orjson.dumps(command, option=orjson.OPT_APPEND_NEWLINE))
+            return orjson.loads(sock.makefile('rb').readline())
+    except socket.timeout:
+        # Something holds the socket but doesn't answer; don't treat it as absent
+        return {'status': 'error', 'error': f"Daemon at {socket_path} did not answer within {timeout} seconds"}
+    except (OSError, orjson.JSONDecodeError):
+        return None
+
+
+def _extract_shard(user_data_dir: str, headless: bool, chat_names: List[str]) -> Dict[str, Optional[List[Dict]]]:
+    """Worker process: extract a shard of chats in its own browser."""
+    extractor = WhatsAppExtractor(user_data_dir=user_data_dir, headless=headless)
+    results = {}
+    try:
+        extractor.setup_driver()
+        extractor.navigate_to_whatsapp(interactive=False)
+        for chat_name in chat_names:
+            try:
+                print(f"Processing chat: {chat_name}")
+                results[chat_name] = extractor.extract_chat_messages(chat_name)
+            except Exception as e:
+                print(f"  Error processing chat '{chat_name}': {e}")
+    finally:
+        if extractor.driver:
+            extractor.driver.quit()
+    return results
+
 
 def main():
     parser = argparse.ArgumentParser(description="Extract messages from WhatsApp Web")
@@ -575,20 +1082,75 @@ def main():
     parser.add_argument("--headless", action="store_true", help="Run in headless mode")
     parser.add_argument("--max-chats", type=int, help="Maximum number of chats to process in all-chats mode")
     parser.add_argument("--debug", action="store_true", help="Enable debug mode with verbose output")
+    parser.add_argument("--workers", type=int, default=1,
+                        help=f"Parallel browsers for all-chats mode, each linked as its own device "
+                             f"on first use (default: 1, max: {MAX_WORKERS})")
+    parser.add_argument("--daemon", action="store_true", help="Keep the browser open and serve extraction requests from later runs")
     
     args = parser.parse_args()
-    
-    if args.debug:
-        print("Debug mode enabled - browser will stay open for inspection")
-        print("Press Ctrl+C to exit after extraction")
+    if args.workers > 1 and args.headless:
+        parser.error("--workers above 1 needs the logged-in profile, which --headless does not load")
+    if args.workers > MAX_WORKERS:
+        parser.error(f"--workers can be at most {MAX_WORKERS}: WhatsApp links at most {MAX_LINKED_DEVICES} "
+                     f"devices and the main profile is one of them")
+    if args.workers > 1 and Path(args.user_data).name in ('', '.', '..'):
+        parser.error("--workers above 1 needs --user-data to name a directory, worker profiles are created next to it")
     
     extractor = WhatsAppExtractor(
         user_data_dir=args.user_data,
         headless=args.headless
     )
     
+    if args.daemon:
+        if not hasattr(socketserver, 'ThreadingUnixStreamServer'):
+            print("Daemon mode needs Unix domain sockets, which this platform does not support")
+            return
+        try:
+            extractor.serve()
+        except KeyboardInterrupt:
+            print("\nDaemon stopped")
+        return
+        
+    # Hand the job to a running daemon if there is one; a short ping first so
+    # a wedged daemon is reported instead of blocking this run
+    response = send_to_daemon({'action': 'ping'}, timeout=DAEMON_PING_TIMEOUT)
+    if response is not None and response.get('status') == 'ok':
+        response = send_to_daemon({
+            'action': 'extract',
+            'chat': args.chat,
+            'max_chats': args.max_chats,
+            'workers': args.workers,
+        }) or {'status': 'error', 'error': f"Daemon at {DAEMON_SOCKET} stopped before answering"}
+    if response is not None:
+        # The daemon's browser is already set up, so these flags can't apply
+        ignored = [flag for flag, used in (
+            ("--headless", args.headless),
+            ("--user-data", args.user_data != parser.get_default("user_data")),
+            ("--debug", args.debug),
+        ) if used]
+        if ignored:
+            print(f"Warning: a daemon handled this run, ignoring {', '.join(ignored)}")
+            
+        if response.get('status') == 'busy':
+            print(f"Daemon at {DAEMON_SOCKET} is busy with another extraction, try again when it finishes")
+        elif response.get('status') != 'ok':
+            print(f"Daemon error: {response.get('error')}")
+        elif not response.get('found'):
+            print(f"Daemon found nothing to extract: {args.chat or 'no visible chats'}")
+        elif not response.get('messages'):
+            print("Daemon found no messages to save")
+        else:
+            print(f"Daemon extracted {response['messages']} messages")
+            for path in response.get('outputs', []):
+                print(f"  {path}")
+        return
+        
+    if args.debug:
+        print("Debug mode enabled - browser will stay open for inspection")
+        print("Press Ctrl+C to exit after extraction")
+    
     try:
-        extractor.run(chat_name=args.chat, max_chats=args.max_chats, debug=args.debug)
+        extractor.run(chat_name=args.chat, max_chats=args.max_chats, debug=args.debug, workers=args.workers)
     except KeyboardInterrupt:
         print("\nExtraction interrupted by user")
     except Exception as e:
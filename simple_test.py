@@ -1,42 +1,46 @@
 #!/usr/bin/env python3
 """
 Simple test to check if Chrome and Selenium work properly
+
+Run directly, or under pytest with the session scratch_driver from conftest.py:
+  pytest simple_test.py
+Runs headless; set WA_HEADLESS=0 to watch the browser.
 """
 
-import time
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+GOOGLE_URL = "https://www.google.com"
+READY_TIMEOUT = 10
 
-def simple_test():
+def test_chrome_startup(scratch_driver):
     """Simple test to check Chrome startup."""
+    driver = scratch_driver
     print("Testing Chrome startup...")
     
     try:
-        chrome_options = Options()
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--remote-debugging-port=9224")
-        
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        
         print("Chrome started successfully!")
         print("Navigating to Google...")
-        driver.get("https://www.google.com")
+        driver.get(GOOGLE_URL)
         
         print(f"Page title: {driver.title}")
         print("Test successful! Chrome is working.")
         
-        time.sleep(3)
-        driver.quit()
+        # Make sure the page is actually interactive, not just titled
+        WebDriverWait(driver, READY_TIMEOUT).until(EC.presence_of_element_located((By.NAME, "q")))
         print("Test completed successfully!")
         
     except Exception as e:
         print(f"Test failed: {e}")
         print("Chrome startup issue detected.")
+        raise
 
 if __name__ == "__main__":
-    simple_test()
+    from conftest import make_scratch_driver
+    
+    driver = make_scratch_driver()
+    try:
+        test_chrome_startup(driver)
+    finally:
+        driver.quit()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Offline tests for the conversation snapshot parser in main.py
+
+These need no browser:
+  pytest test_parsing.py
+"""
+
+from main import WhatsAppExtractor
+
+# data-testid bubbles, the layout parse_messages_html tries first
+TESTID_HTML = """
+<div id="main">
+  <div data-testid="msg-container" class="message-in">
+    <div data-pre-plain-text="[10:15, 3/4/2024] Alice: ">
+      <span dir="auto">Is the flat still available?</span>
+    </div>
+  </div>
+  <div data-testid="msg-container" class="message-in">
+    <div data-pre-plain-text="[10:15, 3/4/2024] Alice: ">
+      <span dir="ltr">Here is a photo</span>
+      <img src="blob:photo">
+    </div>
+  </div>
+</div>
+"""
+
+# Builds that strip data-testid: only the class names and selectable-text remain
+CLASS_ONLY_HTML = """
+<div id="main">
+  <div class="message-in focusable-list-item">
+    <div data-pre-plain-text="[9:02, 5/4/2024] Bob: ">
+      <span class="selectable-text copyable-text">Viewing at 6?</span>
+    </div>
+  </div>
+  <div class="message-out focusable-list-item">
+    <div>
+      <span class="selectable-text copyable-text">Works for me</span>
+    </div>
+  </div>
+</div>
+"""
+
+def _parse(html):
+    """Run the snapshot parser the way extract_messages_from_chat does."""
+    extractor = WhatsAppExtractor()
+    raw_messages = extractor.parse_messages_html(html)
+    metadata = extractor.parse_metadata([raw['pre'] for raw in raw_messages])
+    return [
+        extractor.parse_message(raw, "Flat 4B", timestamp, sender)
+        for raw, (timestamp, sender) in zip(raw_messages, metadata)
+    ]
+
+def test_testid_bubbles():
+    """msg-container bubbles yield their text, sender, timestamp and media flag."""
+    messages = _parse(TESTID_HTML)
+    assert [m['text'] for m in messages] == ["Is the flat still available?", "Here is a photo"]
+    assert [m['sender'] for m in messages] == ["Alice", "Alice"]
+    assert [m['timestamp'] for m in messages] == ["3/4/2024 10:15", "3/4/2024 10:15"]
+    assert [m['has_media'] for m in messages] == [False, True]
+    assert all(m['chat_name'] == "Flat 4B" for m in messages)
+
+def test_class_only_bubbles():
+    """Without data-testid, the class and selectable-text fallbacks still find messages."""
+    messages = _parse(CLASS_ONLY_HTML)
+    assert [m['text'] for m in messages] == ["Viewing at 6?", "Works for me"]
+    assert messages[0]['sender'] == "Bob"
+    assert messages[0]['timestamp'] == "5/4/2024 9:02"
+
+def test_outgoing_message_is_from_me():
+    """A message-out bubble with no metadata is attributed to 'Me'."""
+    messages = _parse(CLASS_ONLY_HTML)
+    assert messages[1]['sender'] == "Me"
+    assert messages[1]['timestamp'] == ""
+
+def test_parse_metadata_shared_prefixes():
+    """Repeated prefixes parse to the same pair; blank or malformed ones to empty strings."""
+    pre = "[10:15:30, 3/4/2024] Alice Smith: "
+    assert WhatsAppExtractor().parse_metadata([pre, pre, "", "not metadata"]) == [
+        ("3/4/2024 10:15:30", "Alice Smith"),
+        ("3/4/2024 10:15:30", "Alice Smith"),
+        ("", ""),
+        ("", ""),
+    ]
@@ -1,124 +1,238 @@
 #!/usr/bin/env python3
 """
 Simple test script to debug WhatsApp Web loading issues
+
+Run directly, or under pytest with the session driver from conftest.py:
+  pytest test_whatsapp.py
+  pytest -n 2 simple_test.py test_whatsapp.py  (the two tests use separate browsers)
+Prompts are skipped when stdin is not a terminal (pytest workers), so scan
+the QR code with a direct run first to log the ./user_data profile in.
+Set WA_HEADLESS=1 to run without a window once the profile is logged in, and
+WA_DEBUG=1 to print the first few chat names.
 """
 
-import time
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+WA_URL = "https://web.whatsapp.com"
+
+QR_CODE_XPATH = "//div[@data-testid='qr-code'] | //canvas[@data-testid='qr-code']"
+CHAT_GRID_XPATH = "//div[@role='grid']"
+CHAT_ROW_XPATH = "//div[@role='row']"
+CHAT_ELEMENTS_XPATH = "//div[contains(@class, 'chat') or contains(@data-testid, 'chat')]"
+
+# Chat list candidates, tried in order
+SELECTORS_TO_TRY = (
+    "//div[@role='grid']",
+    "//div[@data-testid='chat-list']",
+    "//div[contains(@class, 'chat-list')]",
+    "//div[@role='application']//div[@role='grid']",
+)
+
+# First visible node of the union of the XPaths in arguments[0], paired with
+# the first XPath that matches it, or null when nothing visible matches
+FIND_VISIBLE_JS = """
+var selectors = arguments[0];
+var result = document.evaluate(selectors.join(' | '), document, null, XPathResult.ORDERED_NODE_ITERATOR_TYPE, null);
+var node;
+while ((node = result.iterateNext())) {
+    if (node.offsetParent !== null) {
+        break;
+    }
+}
+if (!node) {
+    return null;
+}
+for (var i = 0; i < selectors.length; i++) {
+    var matches = document.evaluate(selectors[i], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (var j = 0; j < matches.snapshotLength; j++) {
+        if (matches.snapshotItem(j) === node) {
+            return [node, selectors[i]];
+        }
+    }
+}
+return null;
+"""
+
+# Injected before any page script runs so the browser opens connections to
+# the WhatsApp origins while the app is still booting
+PRECONNECT_JS = """
+['https://web.whatsapp.com', 'https://static.whatsapp.net'].forEach(function (origin) {
+    var link = document.createElement('link');
+    link.rel = 'preconnect';
+    link.href = origin;
+    link.crossOrigin = '';
+    (document.head || document.documentElement).appendChild(link);
+});
+"""
 
-def test_whatsapp_loading():
+# Timeouts in seconds unless noted
+LOAD_TIMEOUT = 30
+CACHED_SELECTOR_TIMEOUT = 3
+PROBE_TIMEOUT = 1
+SCROLL_QUIET_MS = 800
+SCROLL_DEADLINE_MS = 12000
+SCROLL_SCRIPT_TIMEOUT = 15
+
+# Title of the first titled span in each of the first arguments[0] chat rows
+# (all rows when null), as plain strings so no element handles go stale
+CHAT_TITLES_JS = """
+var rows = Array.from(document.querySelectorAll("div[role='row']"));
+return rows.slice(0, arguments[0] == null ? rows.length : arguments[0]).map(function (row) {
+    var title = row.querySelector('span[title]');
+    return title ? title.getAttribute('title') : null;
+}).filter(Boolean);
+"""
+
+# Async script: keeps the chat list scrolled to the bottom while rows keep
+# arriving, then resolves with the row count once it has been quiet for
+# arguments[1] ms (or the arguments[2] ms deadline passes)
+SCROLL_TO_END_JS = """
+var list = arguments[0], quietMs = arguments[1], deadlineMs = arguments[2];
+var done = arguments[arguments.length - 1];
+var timer, deadline;
+var observer = new MutationObserver(function () {
+    list.scrollTop = list.scrollHeight;
+    clearTimeout(timer);
+    timer = setTimeout(finish, quietMs);
+});
+function finish() {
+    observer.disconnect();
+    clearTimeout(timer);
+    clearTimeout(deadline);
+    done(document.querySelectorAll("div[role='row']").length);
+}
+observer.observe(list, {childList: true, subtree: true});
+list.scrollTop = list.scrollHeight;
+timer = setTimeout(finish, quietMs);
+deadline = setTimeout(finish, deadlineMs);
+"""
+
+# WA_DEBUG=1 prints each chat name, and keeps runs short by only listing the
+# first few chats
+DEBUG = bool(int(os.environ.get("WA_DEBUG", "0")))
+DEBUG_CHAT_LIMIT = 10
+
+# Winning chat list selector from the last run, keyed by WhatsApp build
+CACHE = Path(".wa_selector_cache.json")
+BUILD_JS = "var meta = document.querySelector('meta[name=build]'); return meta ? meta.content : null;"
+
+def _pause(prompt):
+    """Wait for Enter when run interactively; pytest workers have no terminal."""
+    if sys.stdin.isatty():
+        input(prompt)
+
+def test_whatsapp_load(driver):
     """Test WhatsApp Web loading with debug output."""
-    print("Setting up Chrome driver...")
-    
-    # Create user data directory with absolute path
-    import os
-    user_data_dir = os.path.abspath("./user_data")
-    os.makedirs(user_data_dir, exist_ok=True)
-    print(f"Using user data directory: {user_data_dir}")
-    
-    chrome_options = Options()
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
-    chrome_options.add_argument("--remote-debugging-port=0")  # Use random port
-    
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    
     try:
+        # Keep the HTTP cache on and preconnect before navigating
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": False})
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": PRECONNECT_JS})
+        
         print("Navigating to WhatsApp Web...")
-        driver.get("https://web.whatsapp.com")
+        # Doesn't block on the load event; the wait below is what matters
+        driver.execute_cdp_cmd("Page.navigate", {"url": WA_URL})
         
-        print("Waiting 10 seconds for page to load...")
-        time.sleep(10)
+        print("Waiting for QR code or chat list...")
+        try:
+            WebDriverWait(driver, LOAD_TIMEOUT).until(EC.any_of(
+                EC.presence_of_element_located((By.XPATH, QR_CODE_XPATH)),
+                EC.presence_of_element_located((By.XPATH, CHAT_GRID_XPATH)),
+            ))
+        except TimeoutException:
+            print(f"Neither QR code nor chat list appeared within {LOAD_TIMEOUT} seconds")
         
         print(f"Current URL: {driver.current_url}")
         print(f"Page title: {driver.title}")
         
         # Check for QR code
-        qr_elements = driver.find_elements(By.XPATH, "//div[@data-testid='qr-code'] | //canvas[@data-testid='qr-code']")
+        qr_elements = driver.find_elements(By.XPATH, QR_CODE_XPATH)
         if qr_elements:
+            if not sys.stdin.isatty():
+                pytest.skip("WhatsApp profile is logged out; scan the QR code with a direct run first")
             print("QR code found - scan it with your phone")
-            input("Press Enter after scanning QR code...")
+            _pause("Press Enter after scanning QR code...")
         
         # Wait for interface to load
         print("Waiting for interface to load...")
-        time.sleep(5)
+        try:
+            WebDriverWait(driver, LOAD_TIMEOUT).until(EC.presence_of_element_located((By.XPATH, CHAT_ROW_XPATH)))
+        except TimeoutException:
+            print(f"No chat rows appeared within {LOAD_TIMEOUT} seconds")
         
         # Try to find chat list
-        selectors_to_try = [
-            "//div[@role='grid']",
-            "//div[@data-testid='chat-list']",
-            "//div[contains(@class, 'chat-list')]",
-            "//div[@role='application']//div[@role='grid']"
-        ]
-        
+        cache = json.loads(CACHE.read_text()) if CACHE.exists() else {}
+        build = driver.execute_script(BUILD_JS)
+        cached = cache.get("chat_list_xpath") if cache.get("build") == build else None
+
         chat_list_element = None
-        for i, selector in enumerate(selectors_to_try):
-            elements = driver.find_elements(By.XPATH, selector)
-            print(f"Selector {i+1}: {selector} - Found {len(elements)} elements")
-            if elements and elements[0].is_displayed():
-                chat_list_element = elements[0]
-                print(f"  Using this selector for chat list")
-                break
+        if cached:
+            try:
+                chat_list_element = WebDriverWait(driver, CACHED_SELECTOR_TIMEOUT).until(
+                    EC.visibility_of_element_located((By.XPATH, cached))
+                )
+                print(f"Using cached selector for chat list: {cached}")
+            except TimeoutException:
+                print(f"Cached selector no longer matches: {cached}")
+
+        if not chat_list_element:
+            # Probe every candidate at once in the browser
+            try:
+                chat_list_element, selector = WebDriverWait(driver, PROBE_TIMEOUT).until(
+                    lambda d: d.execute_script(FIND_VISIBLE_JS, list(SELECTORS_TO_TRY))
+                )
+                print(f"Using selector for chat list: {selector}")
+                CACHE.write_text(json.dumps({"chat_list_xpath": selector, "build": build}))
+            except TimeoutException:
+                print("No chat list selector matched a visible element")
+        
+        assert chat_list_element is not None, "WhatsApp Web never showed a chat list"
+        
+        print("Scrolling through chat list to load all chats...")
         
-        if chat_list_element:
-            print("Scrolling through chat list to load all chats...")
-            
-            # Scroll to load more chats
-            last_height = driver.execute_script("return arguments[0].scrollHeight", chat_list_element)
-            scroll_attempts = 0
-            max_scrolls = 5
-            
-            while scroll_attempts < max_scrolls:
-                # Scroll down
-                driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight", chat_list_element)
-                time.sleep(2)
-                
-                # Check if new content loaded
-                new_height = driver.execute_script("return arguments[0].scrollHeight", chat_list_element)
-                if new_height == last_height:
-                    break
-                last_height = new_height
-                scroll_attempts += 1
-                print(f"  Scroll {scroll_attempts}: Loaded more content")
-            
-            # Now get all chat rows
-            chat_rows = driver.find_elements(By.XPATH, "//div[@role='row']")
-            print(f"Found {len(chat_rows)} total chat rows after scrolling")
-            
-            # Extract chat names
-            chat_names = []
-            for i, row in enumerate(chat_rows[:10]):  # Limit to first 10 for testing
-                try:
-                    # Try to get chat name
-                    name_elements = row.find_elements(By.XPATH, ".//span[@title]")
-                    if name_elements:
-                        chat_name = name_elements[0].get_attribute('title')
-                        if chat_name and chat_name not in chat_names:
-                            chat_names.append(chat_name)
-                            print(f"  Chat {i+1}: {chat_name}")
-                except Exception as e:
-                    print(f"  Error getting chat name for row {i+1}: {e}")
-            
-            print(f"Total unique chats found: {len(chat_names)}")
+        # Keep scrolling in-page until new rows stop arriving
+        driver.set_script_timeout(SCROLL_SCRIPT_TIMEOUT)
+        row_count = driver.execute_async_script(
+            SCROLL_TO_END_JS, chat_list_element, SCROLL_QUIET_MS, SCROLL_DEADLINE_MS
+        )
+        print(f"Found {row_count} total chat rows after scrolling")
+        
+        # Extract chat names in a single round-trip
+        titles = driver.execute_script(CHAT_TITLES_JS, DEBUG_CHAT_LIMIT if DEBUG else None)
+        chat_names = list(dict.fromkeys(titles))
+        if DEBUG:
+            for i, chat_name in enumerate(chat_names):
+                print(f"  Chat {i+1}: {chat_name}")
+        
+        print(f"Total unique chats found: {len(chat_names)}")
+        assert chat_names, "The chat list has no titled chats"
         
         # Check for any chat-related elements
-        chat_elements = driver.find_elements(By.XPATH, "//div[contains(@class, 'chat') or contains(@data-testid, 'chat')]")
+        chat_elements = driver.find_elements(By.XPATH, CHAT_ELEMENTS_XPATH)
         print(f"Found {len(chat_elements)} chat-related elements")
         
         print("Test completed. Browser will remain open for inspection.")
-        input("Press Enter to close browser...")
+        _pause("Press Enter to close browser...")
         
     except Exception as e:
         print(f"Error: {e}")
-        input("Press Enter to close browser...")
-    finally:
-        driver.quit()
+        _pause("Press Enter to close browser...")
+        raise
 
 if __name__ == "__main__":
-    test_whatsapp_loading()
+    from conftest import make_driver
+    
+    driver = make_driver()
+    try:
+        test_whatsapp_load(driver)
+    finally:
+        driver.quit()